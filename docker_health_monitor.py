@@ -34,24 +34,34 @@ Directory Structure:
 Requirements:
     - docker>=7.0.0
     - python-decouple
+    - orjson (optional, faster parsing of Docker API responses)
 """
 
 import docker
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait
 import time
 import signal
 import sys
-from typing import Dict, Optional, List, Tuple
-from decouple import config
+import threading
+import queue
+import random
+from typing import Dict, Optional, List, Pattern, Set, Tuple
+from decouple import RepositoryEnv
 import logging
 from logging.handlers import RotatingFileHandler
 import re
 import os
+from string import Template
 from pathlib import Path
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # Optional; docker-py falls back to stdlib json
+    orjson = None
 
 
 # Use script directory for logs (both locally and on remote ubuntu)
@@ -78,22 +88,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Docker compose typically names containers: projectname-servicename-1
+_NAME_RE = re.compile(r'^([^-]+)-')
+
+
+@lru_cache(maxsize=1024)
+def _project_from_name(container_name: str) -> str:
+    """Project name inferred from a container name, e.g. 'web-api-1' -> 'web'."""
+    match = _NAME_RE.match(container_name)
+    if match:
+        return match.group(1)
+    return 'unknown'
+
+
+def _smtp_rejection_code(error: Exception) -> Optional[int]:
+    """
+    Reply code with which the SMTP server rejected one message, if it did.
+    
+    Returns None for connection-level failures (dropped connection,
+    failed login, 421 service shutting down), which affect every alert.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # Refused as a whole only if every recipient was; keep the mildest code
+        codes = [code for code, _ in error.recipients.values()]
+        code = min(codes) if codes else None
+    elif isinstance(error, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+        code = error.smtp_code
+    else:
+        return None
+    return None if code == 421 else code
+
 
 class ContainerHealthCheck:
     """Represents a single container health check result."""
     
+    # Created for every checked container each cycle; no per-instance __dict__
+    __slots__ = ('container_name', 'project_name', 'status', 'previous_status', 'timestamp', 'container_id')
+    
     def __init__(
         self, 
         container_name: str, 
         project_name: str, 
         status: Optional[str],
-        previous_status: Optional[str] = None
+        previous_status: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+        container_id: Optional[str] = None
     ):
         self.container_name = container_name
         self.project_name = project_name
         self.status = status
         self.previous_status = previous_status
-        self.timestamp = datetime.now()
+        # Callers checking many containers at once pass one shared timestamp
+        self.timestamp = timestamp or datetime.now()
+        self.container_id = container_id
     
     @property
     def status_changed(self) -> bool:
@@ -106,7 +153,7 @@ class ContainerHealthCheck:
         return (
             self.status_changed and 
             self.status in ['unhealthy', 'starting'] and
-            self.previous_status in ['healthy', 'unknown', None]
+            self.previous_status in ['healthy', 'unknown', 'stuck', None]
         )
     
     @property
@@ -115,42 +162,274 @@ class ContainerHealthCheck:
         return (
             self.status_changed and 
             self.status == 'healthy' and
-            self.previous_status in ['unhealthy', 'starting']
+            self.previous_status in ['unhealthy', 'starting', 'stuck']
         )
 
 
+class ContainerState:
+    """Last known health of a tracked container."""
+    
+    # One per tracked container, updated in place rather than rebuilt each check
+    __slots__ = ('status', 'project', 'last_check', 'id')
+    
+    def __init__(self, status: Optional[str], project: str, last_check: float, container_id: str):
+        self.status = status
+        self.project = project
+        self.last_check = last_check  # time.time() of the last check
+        self.id = container_id
+
+
+class AlertRecord:
+    """An alert email built during a check cycle and waiting to be sent."""
+    
+    def __init__(
+        self,
+        container_name: str,
+        project_name: str,
+        status: str,
+        recipients: List[str],
+        message: EmailMessage,
+        timestamp: Optional[datetime] = None,
+        severity: str = 'INFO',
+        body: str = '',
+        parts: Optional[List['AlertRecord']] = None
+    ):
+        self.container_name = container_name
+        self.project_name = project_name
+        self.status = status
+        self.recipients = recipients
+        self.message = message
+        self.timestamp = timestamp or datetime.now()
+        self.severity = severity
+        self.body = body  # message text without the footer, for digests
+        self.parts = parts or []  # alerts combined into this digest, if it is one
+        self._raw: Optional[bytes] = None
+    
+    def as_bytes(self) -> bytes:
+        """Serialized message, encoded once and reused for every (re)send."""
+        if self._raw is None:
+            # smtplib only normalizes line endings of str payloads, so the
+            # bytes must already use CRLF (bare LF is rejected by many MTAs)
+            self._raw = self.message.as_bytes(policy=self.message.policy.clone(linesep='\r\n'))
+        return self._raw
+
+
 class MultiProjectHealthMonitor:
     """Monitor Docker container health across multiple projects."""
     
+    # Reuse a cached SMTP connection only if it was used this recently
+    SMTP_MAX_IDLE_SEC = 90
+    
+    # Backoff bounds after SMTP or Docker API failures
+    BACKOFF_MIN_SEC = 30
+    BACKOFF_MAX_SEC = 600
+    
+    # Undelivered alerts kept for retry while SMTP is failing
+    MAX_PENDING_ALERTS = 100
+    
+    # The sender thread waits this long after an alert for others to batch with it
+    ALERT_COALESCE_SEC = 2
+    
+    # How long shutdown waits for the sender thread to deliver what it holds
+    ALERT_DRAIN_TIMEOUT_SEC = 60
+    
+    # Alert after this many consecutive Phase 2 rechecks of a container fail
+    STUCK_ALERT_AFTER = 3
+    
+    # Container logs are reused for this long when alerts cluster
+    LOGS_CACHE_TTL_SEC = 30
+    LOGS_CACHE_MAX_ENTRIES = 64
+    
+    # Health token in a /containers/json Status string, e.g.
+    # "Up 5 minutes (healthy)" or "Up 3 seconds (health: starting)"
+    _HEALTH_RE = re.compile(r'\((?:health: )?(healthy|unhealthy|starting)\)')
+    
+    # Alert email body: header + status-specific action steps + footer
+    _HEADER_TEMPLATE = Template("""
+Docker Container Health Alert
+==============================
+
+Server:          $server
+Project:         $project
+Container:       $container
+Status Change:   $status_change
+Severity:        $severity
+Time:            $time
+
+Details:
+--------
+$details
+
+Action Required:
+----------------
+""")
+    
+    _ACTION_TEMPLATES = {
+        'unhealthy': Template("""
+1. Check container logs:
+   docker logs $container
+
+2. Inspect container:
+   docker inspect $container
+
+3. Restart container:
+   docker restart $container
+   
+   Or navigate to project and restart:
+   cd /path/to/$project
+   docker compose restart
+
+4. Check application health endpoint
+
+5. Review recent code changes or deployments
+"""),
+        'not_found': Template("""
+1. Check if container is running:
+   docker ps -a | grep $container
+
+2. Navigate to project directory:
+   cd /path/to/$project
+
+3. Check docker-compose status:
+   docker compose ps
+
+4. Restart services:
+   docker compose up -d
+
+5. Check docker-compose.yml configuration
+"""),
+        'default': Template("""
+Monitor the situation and check logs for more information.
+"""),
+    }
+    
+    _CONTEXT_TEMPLATE = Template("""
+
+Project Context:
+----------------
+Container name: $container
+Project name:   $project
+Status:         $status
+""")
+    
+    # Alerts for the same recipients raised together are sent as one digest
+    _DIGEST_HEADER_TEMPLATE = Template("""
+Docker Container Health Digest
+==============================
+
+Server:          $server
+Alerts:          $count
+Projects:        $projects
+Time:            $time
+""")
+    
+    # Alert severity by status; any other status (e.g. healthy) is INFO
+    _STATUS_SEVERITY = {
+        'unhealthy': 'CRITICAL',
+        'not_found': 'ERROR',
+        'starting': 'WARNING',
+        'stuck': 'WARNING',
+    }
+    _SEVERITY_EMOJI = {'CRITICAL': '!?', 'ERROR': '!?', 'WARNING': '!?', 'INFO': '[OK]'}
+    
+    # Digest subject uses the most severe alert it contains
+    _SEVERITY_ORDER = ('INFO', 'WARNING', 'ERROR', 'CRITICAL')
+    
     def __init__(self):
         """Initialize the health monitor."""
-        self.client = docker.from_env()
-        self.container_states: Dict[str, Dict] = {}  # container_name -> {status, project, last_check}
-        self.shutdown_requested = False
+        # container_name -> last known state. Written only by the main loop, so
+        # no lock is needed; Phase 2 workers only do single get() lookups
+        self.container_states: Dict[str, ContainerState] = {}
+        self._project_cache: Dict[str, str] = {}  # container_id -> project name
+        self._stuck_counts: Dict[str, int] = {}  # container_name -> consecutive recheck timeouts
+        self._logs_cache: Dict[Tuple[str, int], Tuple[float, str]] = {}  # (name, tail) -> (fetched_at, logs)
+        self._logs_lock = threading.Lock()  # logs are fetched from Phase 2 workers
+        # (container_id, health) pairs seen by the last sweep; cleared whenever
+        # container_states changes outside a sweep so the next one rechecks all
+        self._last_tick_fingerprint: Set[Tuple[str, Optional[str]]] = set()
+        self.shutdown_requested = threading.Event()  # set on SIGTERM/SIGINT; wakes interruptible waits
+        
+        # Docker container events, filled by the event watcher thread and
+        # consumed by the main loop between full sweeps
+        self._health_events: queue.Queue = queue.Queue()
+        self._event_thread: Optional[threading.Thread] = None
+        self._event_stream = None
+        self._events_connected = False
+        self._events_subscribed_at = 0.0  # time.time() of the last (re)subscription
+        self._next_sweep_at = 0.0
+        
+        # Load configuration (read once; see _load_env)
+        env = self._load_env()
+        missing = [key for key in ('SMTP_HOST', 'SMTP_USER', 'SMTP_PASS') if key not in env]
+        if missing:
+            raise ValueError(f"{', '.join(missing)} must be configured in .env")
+        
+        self.smtp_host = env['SMTP_HOST']
+        self.smtp_port = int(env.get('SMTP_PORT', 465))
+        self.smtp_user = env['SMTP_USER']
+        self.smtp_pass = env['SMTP_PASS']
         
-        # Load configuration
-        self.smtp_host = config('SMTP_HOST')
-        self.smtp_port = int(config('SMTP_PORT', default=465))
-        self.smtp_user = config('SMTP_USER')
-        self.smtp_pass = config('SMTP_PASS')
+        # Persistent SMTP connection shared by all alerts
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_lock = threading.Lock()
+        self._smtp_last_used = 0.0
         
-        # Thread pool for concurrent operations
-        self.executor = ThreadPoolExecutor(max_workers=30)
+        # Alerts raised during the current check cycle, handed to the sender
+        # thread together by _flush_pending_alerts
+        self._pending_alerts: List[AlertRecord] = []
+        
+        # Alert delivery runs on its own thread so SMTP never stalls a check
+        self._alert_queue: queue.Queue = queue.Queue()  # AlertRecord, or None to stop
+        self._alert_thread: Optional[threading.Thread] = None
+        self._undelivered: List[AlertRecord] = []  # sender thread only; awaiting SMTP retry
+        
+        # Failure backoff (seconds); 0 while the upstream is healthy
+        self._smtp_backoff = 0.0
+        self._smtp_retry_at = 0.0
+        self._docker_backoff = 0.0
+        
+        # Upper bound for concurrent Docker API calls (Phase 2 log fetches)
+        self.max_workers = int(env.get('MONITOR_MAX_WORKERS', 30))
+        
+        # Keep-alive pool big enough for every concurrent caller: the log
+        # workers, the main loop and the long-lived event stream
+        self.client = docker.from_env(max_pool_size=self.max_workers + 2)
+        # Every call below goes through the low-level API: plain dicts, no
+        # Container/Model wrappers
+        self.api = self.client.api
+        if orjson is not None:
+            self._use_orjson(self.api)
 
         # Default alert recipients
         self.default_recipients = [
             email.strip() 
-            for email in config('HEALTH_CHECK_ALERT_EMAILS', default='').split(',')
+            for email in env.get('HEALTH_CHECK_ALERT_EMAILS', '').split(',')
             if email.strip()
         ]
         
         # Project-specific routing (optional)
-        self.project_routing = self._load_project_routing()
+        self.project_routing = self._load_project_routing(env)
+        self._routing_re = self._compile_routing(self.project_routing)
+        self._routing_priority = {pattern: i for i, pattern in enumerate(self.project_routing)}
+        # Routing is fixed after startup, so each (container, project) pair is matched once
+        self._match_routing_pattern = lru_cache(maxsize=2048)(self._match_routing_pattern)
         
-        self.check_interval_sec = int(config('HEALTH_CHECK_INTERVAL_SEC', default=30))
-        self.wait_and_check_again_min = float(config('WAIT_AND_CHECK_AGAIN_MIN', default=15))
-        self.log_tail_lines = int(config('HEALTH_CHECK_LOG_LINES', default=10))
-        self.server_name = config('SERVER_NAME', default='Production')
+        self.check_interval_sec = int(env.get('HEALTH_CHECK_INTERVAL_SEC', 30))
+        self.sweep_interval_sec = int(env.get('HEALTH_SWEEP_INTERVAL_SEC', 300))
+        self.wait_and_check_again_min = float(env.get('WAIT_AND_CHECK_AGAIN_MIN', 15))
+        self.log_tail_lines = int(env.get('HEALTH_CHECK_LOG_LINES', 10))
+        self.log_bytes_cap = int(env.get('MONITOR_LOG_BYTES_CAP', 65536))
+        self.server_name = env.get('SERVER_NAME', 'Production')
+        
+        # Alert text that is the same for every alert, built once
+        self._alert_footer = (
+            "\n---\n"
+            "Automated alert from Multi-Project Docker Health Monitor\n"
+            f"Server: {self.server_name}\n"
+            "Monitoring all containers with healthchecks\n"
+        )
+        self._default_recipients_joined = ', '.join(self.default_recipients)
+        self._routing_joined = {pattern: ', '.join(r) for pattern, r in self.project_routing.items()}
         
         # Validate configuration
         if not self.default_recipients:
@@ -165,22 +444,68 @@ class MultiProjectHealthMonitor:
         logger.info(f"Server: {self.server_name}")
         logger.info(f"Default alert recipients: {', '.join(self.default_recipients)}")
         logger.info(f"Check interval: {self.check_interval_sec} seconds")
+        logger.info(f"Full sweep interval: {self.sweep_interval_sec} seconds")
         logger.info(f"Retry delay: {self.wait_and_check_again_min} minutes")
         if self.project_routing:
             logger.info(f"Project-specific routing configured for: {', '.join(self.project_routing.keys())}")
         logger.info("=" * 70)
     
-    def _load_project_routing(self) -> Dict[str, List[str]]:
+    @staticmethod
+    def _use_orjson(api):
+        """
+        Parse the low-level client's JSON responses with orjson.
+        
+        Replaces _result on this APIClient instance only. Text and binary
+        responses, and the events stream, still go through docker-py.
+        
+        Args:
+            api: docker.APIClient to patch
+        """
+        result = api._result
+        
+        def _result(response, json=False, binary=False):
+            if json:
+                api._raise_for_status(response)
+                return orjson.loads(response.content)
+            return result(response, json=json, binary=binary)
+        
+        api._result = _result
+    
+    def _load_env(self) -> Dict[str, str]:
+        """
+        Read configuration once into a plain dict.
+        
+        The nearest .env file (searched from the script directory upwards,
+        like python-decouple does) is parsed with decouple's own .env
+        parser, then overlaid with os.environ, which takes precedence.
+        
+        Returns:
+            Mapping of configuration keys to raw string values
+        """
+        env: Dict[str, str] = {}
+        base_dir = script_dir.resolve()
+        for directory in (base_dir, *base_dir.parents):
+            env_file = directory / '.env'
+            if env_file.is_file():
+                env.update(RepositoryEnv(str(env_file)).data)
+                break
+        env.update(os.environ)
+        return env
+    
+    def _load_project_routing(self, env: Dict[str, str]) -> Dict[str, List[str]]:
         """
         Load project-specific alert routing from environment.
         
         Format in .env:
         CONTAINER_ALERT_ROUTING=passage-plan:email1@ex.com,email2@ex.com;vessel-cert:email3@ex.com
         
+        Args:
+            env: Configuration mapping from _load_env
+            
         Returns:
             Dict mapping container name patterns to recipient lists
         """
-        routing_str = config('CONTAINER_ALERT_ROUTING', default='')
+        routing_str = env.get('CONTAINER_ALERT_ROUTING', '')
         if not routing_str:
             return {}
         
@@ -195,37 +520,75 @@ class MultiProjectHealthMonitor:
         
         return routing
     
+    def _compile_routing(self, routing: Dict[str, List[str]]) -> Optional[Pattern]:
+        """
+        Compile all routing patterns into one regex for a single-pass scan.
+        
+        Each alternative sits inside a lookahead, so finditer reports a match
+        at every position where some pattern starts and overlapping patterns
+        are not hidden by one another. At any one position the alternation
+        tries patterns in configured order.
+        
+        Args:
+            routing: Mapping of container name patterns to recipient lists
+            
+        Returns:
+            Compiled pattern, or None when no routing is configured
+        """
+        if not routing:
+            return None
+        alternatives = '|'.join(re.escape(pattern) for pattern in routing)
+        return re.compile(f'(?=({alternatives}))')
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         logger.info(f"Received signal {signum}. Shutting down gracefully...")
-        self.shutdown_requested = True
+        self.shutdown_requested.set()
+    
+    def _get_project_name(self, container: Dict, container_name: str) -> str:
+        """
+        Get project name for a container, cached by container ID.
+        
+        Labels cannot change during a container's lifetime, so the name is
+        only worked out once per container.
+        
+        Args:
+            container: Container summary dict from the low-level containers API
+            container_name: Name of the container
+            
+        Returns:
+            Project name string
+        """
+        container_id = container['Id']
+        project_name = self._project_cache.get(container_id)
+        if project_name is None:
+            project_name = self._compute_project_name(container, container_name)
+            self._project_cache[container_id] = project_name
+        return project_name
     
-    def _get_project_name(self, container) -> str:
+    def _compute_project_name(self, container: Dict, container_name: str) -> str:
         """
         Extract project name from container labels or name.
         
         Args:
-            container: Docker container object
+            container: Container summary dict from the low-level containers API
+            container_name: Name of the container
             
         Returns:
             Project name string
         """
-        labels = container.labels
+        # The listing already carries Labels; never fall back to an inspect
+        labels = container.get('Labels') or {}
         
         # Check common docker-compose labels
-        if 'com.docker.compose.project' in labels:
-            return labels['com.docker.compose.project']
+        project = labels.get('com.docker.compose.project')
+        if project:
+            return project
         
         # Fallback: extract from container name
-        # Docker compose typically names containers: projectname-servicename-1
-        container_name = container.name
-        match = re.match(r'^([^-]+)-', container_name)
-        if match:
-            return match.group(1)
-        
-        return 'unknown'
+        return _project_from_name(container_name)
     
-    def _get_recipients_for_container(self, container_name: str, project_name: str) -> List[str]:
+    def _get_recipients_for_container(self, container_name: str, project_name: str) -> Tuple[List[str], str]:
         """
         Get recipient list for a specific container.
         
@@ -236,41 +599,75 @@ class MultiProjectHealthMonitor:
             project_name: Project/compose name
             
         Returns:
-            List of email addresses to notify
+            Tuple of (email addresses to notify, precomputed To: header)
         """
-        # Check if there's project-specific routing
-        for pattern, recipients in self.project_routing.items():
-            if pattern in container_name or pattern in project_name:
-                logger.debug(f"Using project-specific routing for {container_name}: {recipients}")
-                return recipients
+        pattern = self._match_routing_pattern(container_name, project_name)
+        if pattern is not None:
+            recipients = self.project_routing[pattern]
+            logger.debug(f"Using project-specific routing for {container_name}: {recipients}")
+            return (recipients, self._routing_joined[pattern])
         
         # Fall back to default recipients
-        return self.default_recipients
+        return (self.default_recipients, self._default_recipients_joined)
     
-    def get_container_health(self, container) -> Optional[str]:
+    def _match_routing_pattern(self, container_name: str, project_name: str) -> Optional[str]:
         """
-        Get health status of a container.
+        Find the routing pattern that applies to a container.
         
         Args:
-            container: Docker container object
+            container_name: Name of the container
+            project_name: Project/compose name
             
         Returns:
-            Health status string or None if no healthcheck
+            Earliest configured pattern found in either name, or None
         """
-        try:
-            container.reload()  # Refresh container state
-            health = container.attrs.get('State', {}).get('Health', {})
-            return health.get('Status')
-        except docker.errors.NotFound:
-            return 'not_found'
-        except Exception as e:
-            logger.error(f"Error getting health for {container.name}: {e}")
+        if self._routing_re is None:
             return None
+        
+        best = None
+        for text in (container_name, project_name):
+            for match in self._routing_re.finditer(text):
+                pattern = match.group(1)
+                if best is None or self._routing_priority[pattern] < self._routing_priority[best]:
+                    best = pattern
+        return best
+    
+    def get_container_health(self, attrs: Dict) -> Optional[str]:
+        """
+        Get health status of a container from its inspect data.
+        
+        Args:
+            attrs: Container dict from the low-level inspect_container API
+            
+        Returns:
+            Health status string or None if no healthcheck
+        """
+        health = (attrs.get('State') or {}).get('Health') or {}
+        return health.get('Status')
+    
+    def _container_ref(self, container_name: str) -> str:
+        """
+        Id to address a container by in low-level API calls.
+        
+        Args:
+            container_name: Name of the container
+            
+        Returns:
+            Container id from the last check, or the name if none is recorded
+        """
+        state = self.container_states.get(container_name)
+        return state.id if state is not None else container_name
     
     def get_container_logs(self, container_name: str, tail: int = 50) -> str:
         """
         Get recent logs from a container by name.
         
+        Results are cached for LOGS_CACHE_TTL_SEC so a flapping container
+        does not have its logs streamed and decoded again on every alert.
+        Logs are streamed through the low-level API using the container id
+        from the last check. Only the newest log_bytes_cap bytes are kept,
+        so one very long log line cannot balloon memory or the email.
+        
         Args:
             container_name: Name of the container
             tail: Number of lines to retrieve
@@ -278,26 +675,49 @@ class MultiProjectHealthMonitor:
         Returns:
             Container logs as string
         """
+        key = (container_name, tail)
+        now = time.time()
+        cached = self._logs_cache.get(key)
+        if cached is not None and now - cached[0] < self.LOGS_CACHE_TTL_SEC:
+            return cached[1]
+        
         try:
-            container = self.client.containers.get(container_name)
-            logs = container.logs(tail=tail).decode('utf-8', errors='replace')
+            cap = self.log_bytes_cap
+            # follow=False: docker-py defaults follow to stream, which would
+            # never end for a running container
+            stream = self.api.logs(
+                self._container_ref(container_name),
+                stdout=True, stderr=True, tail=tail, stream=True, follow=False
+            )
+            buf = bytearray()
+            try:
+                for chunk in stream:
+                    buf += chunk
+                    # Keep the tail: trim in bulk once the buffer doubles the cap
+                    if len(buf) > 2 * cap:
+                        del buf[:-cap]
+            finally:
+                stream.close()
+            logs = buf[-cap:].decode('utf-8', errors='replace')
+            self._cache_logs(key, now, logs)
             return logs
         except docker.errors.NotFound:
             return "Container not found - may have been removed"
         except Exception as e:
             return f"Could not retrieve logs: {e}"
     
-    def send_alert_email(
+    def _build_alert(
         self, 
         container_name: str,
         project_name: str,
         status: str, 
         details: str,
         previous_status: Optional[str] = None,
-        recipients: Optional[List[str]] = None
-    ):
+        recipients: Optional[List[str]] = None,
+        timestamp: Optional[datetime] = None
+    ) -> AlertRecord:
         """
-        Send email alert for health check status change.
+        Build the alert email for a health check status change.
         
         Args:
             container_name: Name of the container
@@ -306,176 +726,480 @@ class MultiProjectHealthMonitor:
             details: Additional details (logs, error messages)
             previous_status: Previous health status
             recipients: Override recipient list
+            timestamp: When the status was observed (defaults to now)
+            
+        Returns:
+            AlertRecord ready for delivery
         """
         if recipients is None:
-            recipients = self._get_recipients_for_container(container_name, project_name)
+            recipients, to = self._get_recipients_for_container(container_name, project_name)
+        else:
+            to = ', '.join(recipients)
         
         # Determine alert severity
-        if status == 'unhealthy':
-            emoji = '!?'
-            severity = 'CRITICAL'
-        elif status == 'not_found':
-            emoji = '!?'
-            severity = 'ERROR'
-        elif status == 'starting':
-            emoji = '!?'
-            severity = 'WARNING'
-        else:
-            emoji = '[OK]'
-            severity = 'INFO'
+        severity = self._STATUS_SEVERITY.get(status, 'INFO')
+        emoji = self._SEVERITY_EMOJI[severity]
         
         subject = f"{emoji} {severity}: [{project_name}] {container_name} - Health Status Changed"
+        timestamp = timestamp or datetime.now()
         
-        # Build email body
+        # Build email body from the precompiled templates
         status_change = f"{previous_status} → {status}" if previous_status else status
+        fields = {
+            'server': self.server_name,
+            'project': project_name,
+            'container': container_name,
+            'status': status,
+            'status_change': status_change,
+            'severity': severity,
+            'time': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+            'details': details,
+        }
+        action = self._ACTION_TEMPLATES.get(status, self._ACTION_TEMPLATES['default'])
+        body = ''.join([
+            self._HEADER_TEMPLATE.substitute(fields),
+            action.substitute(fields),
+            self._CONTEXT_TEMPLATE.substitute(fields),
+        ])
         
-        body = f"""
-Docker Container Health Alert
-==============================
-
-Server:          {self.server_name}
-Project:         {project_name}
-Container:       {container_name}
-Status Change:   {status_change}
-Severity:        {severity}
-Time:            {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-Details:
---------
-{details}
-
-Action Required:
-----------------
-"""
+        # Create email message (single plain-text part, no multipart wrapper)
+        msg = EmailMessage()
+        msg['From'] = self.smtp_user
+        msg['To'] = to
+        msg['Subject'] = subject
+        msg.set_content(body + self._alert_footer, cte='quoted-printable')
         
-        if status == 'unhealthy':
-            body += f"""
-1. Check container logs:
-   docker logs {container_name}
-
-2. Inspect container:
-   docker inspect {container_name}
-
-3. Restart container:
-   docker restart {container_name}
-   
-   Or navigate to project and restart:
-   cd /path/to/{project_name}
-   docker compose restart
-
-4. Check application health endpoint
-
-5. Review recent code changes or deployments
-"""
-        elif status == 'not_found':
-            body += f"""
-1. Check if container is running:
-   docker ps -a | grep {container_name}
-
-2. Navigate to project directory:
-   cd /path/to/{project_name}
-
-3. Check docker-compose status:
-   docker compose ps
-
-4. Restart services:
-   docker compose up -d
-
-5. Check docker-compose.yml configuration
-"""
-        else:
-            body += """
-Monitor the situation and check logs for more information.
-"""
+        return AlertRecord(
+            container_name, project_name, status, recipients, msg, timestamp,
+            severity=severity, body=body
+        )
+    
+    def _build_digest(self, alerts: List[AlertRecord]) -> AlertRecord:
+        """
+        Combine alerts for the same recipients into one digest email.
         
-        body += f"""
-
-Project Context:
-----------------
-Container name: {container_name}
-Project name:   {project_name}
-Status:         {status}
-
----
-Automated alert from Multi-Project Docker Health Monitor
-Server: {self.server_name}
-Monitoring all containers with healthchecks
-"""
+        Args:
+            alerts: Two or more AlertRecord objects sharing a recipient list
+            
+        Returns:
+            AlertRecord whose parts are the combined alerts
+        """
+        severity = max((alert.severity for alert in alerts), key=self._SEVERITY_ORDER.index)
+        emoji = self._SEVERITY_EMOJI[severity]
+        projects = ', '.join(sorted({alert.project_name for alert in alerts}))
+        timestamp = max(alert.timestamp for alert in alerts)
+        
+        sections = [self._DIGEST_HEADER_TEMPLATE.substitute(
+            server=self.server_name,
+            count=len(alerts),
+            projects=projects,
+            time=timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        )]
+        for alert in alerts:
+            sections.append(f"\n{'=' * 70}\n{alert.message['Subject']}\n{'=' * 70}\n{alert.body}")
+        sections.append(self._alert_footer)
         
-        # Create email message
-        msg = MIMEMultipart()
+        msg = EmailMessage()
         msg['From'] = self.smtp_user
-        msg['To'] = ', '.join(recipients)
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
+        msg['To'] = alerts[0].message['To']
+        msg['Subject'] = f"{emoji} {severity}: {len(alerts)} container alerts on {self.server_name}"
+        msg.set_content(''.join(sections), cte='quoted-printable')
+        
+        return AlertRecord(
+            f"{len(alerts)} containers", projects, 'digest', alerts[0].recipients, msg, timestamp,
+            severity=severity, parts=alerts
+        )
+    
+    def _cache_logs(self, key: Tuple[str, int], fetched_at: float, logs: str):
+        """
+        Store fetched logs, keeping the cache within LOGS_CACHE_MAX_ENTRIES.
+        
+        Args:
+            key: (container_name, tail) cache key
+            fetched_at: time.time() of the fetch
+            logs: Decoded log text
+        """
+        with self._logs_lock:
+            self._logs_cache[key] = (fetched_at, logs)
+            if len(self._logs_cache) <= self.LOGS_CACHE_MAX_ENTRIES:
+                return
+            
+            # Drop expired entries first, then the oldest if still over the limit
+            for k, (ts, _) in list(self._logs_cache.items()):
+                if fetched_at - ts >= self.LOGS_CACHE_TTL_SEC:
+                    del self._logs_cache[k]
+            while len(self._logs_cache) > self.LOGS_CACHE_MAX_ENTRIES:
+                del self._logs_cache[min(self._logs_cache, key=lambda k: self._logs_cache[k][0])]
+    
+    def _flush_alert_queue(self, alerts: List[AlertRecord]):
+        """
+        Deliver alerts back-to-back over one SMTP connection.
+        
+        The connection (and its TLS handshake and login) is shared by the
+        whole batch instead of being set up once per alert.
+        
+        Args:
+            alerts: AlertRecord objects to send
+        """
+        if not alerts:
+            return
+        
+        if time.time() < self._smtp_retry_at:
+            held = sum(len(alert.parts or [alert]) for alert in alerts)
+            logger.debug(f"SMTP backoff active; holding {held} alert(s) until it expires")
+            self._requeue_alerts(alerts)
+            return
+        
+        deferred = []
+        with self._smtp_lock:
+            for i, alert in enumerate(alerts):
+                try:
+                    self._deliver_alert(alert)
+                except Exception as e:
+                    code = _smtp_rejection_code(e)
+                    if code is not None and code >= 500:
+                        # Permanent rejection of this message: retrying cannot help
+                        logger.error(
+                            f"✗ Alert email for {alert.container_name} rejected by the SMTP "
+                            f"server ({e}); dropping {len(alert.parts or [alert])} alert(s)"
+                        )
+                        continue
+                    if code is not None:
+                        # Temporary rejection of this message; the others can still go out
+                        logger.warning(f"Alert email for {alert.container_name} deferred by the SMTP server ({e})")
+                        deferred.append(alert)
+                        continue
+                    
+                    # Connection-level failure: the rest of the batch would fail too
+                    self._close_smtp()
+                    self._smtp_backoff = self._compute_backoff_seconds(self._smtp_backoff)
+                    self._smtp_retry_at = time.time() + self._smtp_backoff
+                    # Count the alerts inside digests, not the emails
+                    retrying = sum(len(a.parts or [a]) for a in deferred + alerts[i:])
+                    logger.error(
+                        f"✗ Failed to send alert email for {alert.container_name}: {e}; "
+                        f"retrying {retrying} alert(s) in {self._smtp_backoff:.0f}s"
+                    )
+                    self._requeue_alerts(deferred + alerts[i:])
+                    return
+        
+        if deferred:
+            self._smtp_backoff = self._compute_backoff_seconds(self._smtp_backoff)
+            self._smtp_retry_at = time.time() + self._smtp_backoff
+            retrying = sum(len(a.parts or [a]) for a in deferred)
+            logger.error(f"✗ Retrying {retrying} deferred alert(s) in {self._smtp_backoff:.0f}s")
+            self._requeue_alerts(deferred)
+    
+    def _deliver_alert(self, alert: AlertRecord):
+        """
+        Send one alert over the cached SMTP connection.
         
-        # Send email
+        Must be called with self._smtp_lock held. A stale connection is
+        replaced and the send retried once before giving up; a rejection of
+        the message itself is raised straight away.
+        
+        Args:
+            alert: AlertRecord to send
+            
+        Raises:
+            Exception: If the retry fails as well
+        """
+        raw = alert.as_bytes()
         try:
-            if self.smtp_port == 587:
-                # Use STARTTLS for port 587
-                with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30) as server:
-                    server.starttls()
-                    server.login(self.smtp_user, self.smtp_pass)
-                    server.send_message(msg)
-            else:
-                # Use SSL for port 465
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=30) as server:
-                    server.login(self.smtp_user, self.smtp_pass)
-                    server.send_message(msg)
-            logger.info(f"✓ Alert sent for [{project_name}] {container_name} to {', '.join(recipients)}")
-        except Exception as e:
-            logger.error(f"✗ Failed to send alert email: {e}")
+            self._get_smtp().sendmail(self.smtp_user, alert.recipients, raw)
+        except (smtplib.SMTPException, OSError) as e:
+            if _smtp_rejection_code(e) is not None:
+                raise
+            # Cached connection went stale; reconnect and retry once
+            logger.warning(f"SMTP connection failed ({e}); reconnecting and retrying once")
+            self._close_smtp()
+            self._get_smtp().sendmail(self.smtp_user, alert.recipients, raw)
+        self._smtp_last_used = time.time()
+        self._smtp_backoff = 0.0
+        logger.info(f"✓ Alert sent for [{alert.project_name}] {alert.container_name} to {alert.message['To']}")
+    
+    def _requeue_alerts(self, alerts: List[AlertRecord]):
+        """
+        Put undelivered alerts back at the front of the retry list.
+        
+        Args:
+            alerts: AlertRecord objects to retry once the SMTP backoff expires
+        """
+        # Digests are split back up so they can be regrouped on the next send
+        self._undelivered[:0] = [part for alert in alerts for part in (alert.parts or [alert])]
+        dropped = len(self._undelivered) - self.MAX_PENDING_ALERTS
+        if dropped > 0:
+            logger.warning(f"Alert queue full; dropping {dropped} oldest undelivered alert(s)")
+            del self._undelivered[:dropped]
+    
+    def _compute_backoff_seconds(self, previous: float) -> float:
+        """
+        Next backoff delay after a failure, using decorrelated jitter.
+        
+        The delay is drawn between BACKOFF_MIN_SEC and three times the previous
+        one (capped at BACKOFF_MAX_SEC), so retries after a shared outage
+        spread out instead of firing in lockstep.
+        
+        Args:
+            previous: Previous backoff in seconds (0 if none)
+            
+        Returns:
+            Backoff delay in seconds
+        """
+        base = self.BACKOFF_MIN_SEC
+        upper = max(previous, base) * 3
+        return min(self.BACKOFF_MAX_SEC, base + random.random() * (upper - base))
+    
+    def _flush_pending_alerts(self):
+        """Hand the alerts raised so far in this check cycle to the sender thread."""
+        pending, self._pending_alerts = self._pending_alerts, []
+        for alert in pending:
+            self._alert_queue.put(alert)
+    
+    def _alert_sender_loop(self):
+        """
+        Deliver queued alerts until the None sentinel arrives (runs in a thread).
+        
+        This thread owns SMTP delivery and the retry list. Alerts still
+        undelivered after the sentinel (e.g. during an SMTP backoff) are logged
+        and dropped.
+        """
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_alert_batch()
+            pending, self._undelivered = self._undelivered + batch, []
+            self._send_alerts(pending)
+        
+        if self._undelivered:
+            logger.warning(f"✗ Shutting down with {len(self._undelivered)} undelivered alert(s)")
+    
+    def _next_alert_batch(self) -> Tuple[List[AlertRecord], bool]:
+        """
+        Wait for queued alerts and collect those arriving close together.
+        
+        Blocks until an alert arrives (or an SMTP retry is due), then keeps
+        collecting for ALERT_COALESCE_SEC so a burst is sent together.
+        
+        Returns:
+            Tuple of (new alerts, whether the stop sentinel was received)
+        """
+        timeout = max(self._smtp_retry_at - time.time(), 0.0) if self._undelivered else None
+        try:
+            alert = self._alert_queue.get(timeout=timeout)
+        except queue.Empty:
+            return ([], False)
+        if alert is None:
+            return ([], True)
+        
+        batch = [alert]
+        deadline = time.time() + self.ALERT_COALESCE_SEC
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return (batch, False)
+            try:
+                alert = self._alert_queue.get(timeout=remaining)
+            except queue.Empty:
+                return (batch, False)
+            if alert is None:
+                return (batch, True)
+            batch.append(alert)
+    
+    def _send_alerts(self, pending: List[AlertRecord]):
+        """
+        Send a batch of alerts, keeping only the latest per container.
+        
+        Alerts that share a recipient list are combined into one digest email.
+        
+        Args:
+            pending: AlertRecord objects, oldest retries first
+        """
+        # An older alert for the same container (e.g. one held through an SMTP
+        # backoff) is superseded by its latest status
+        latest = {alert.container_name: alert for alert in sorted(pending, key=lambda a: a.timestamp)}
+        if len(latest) < len(pending):
+            logger.debug(f"Collapsed {len(pending) - len(latest)} superseded alert(s)")
+        
+        groups: Dict[frozenset, List[AlertRecord]] = {}
+        for alert in latest.values():
+            groups.setdefault(frozenset(alert.recipients), []).append(alert)
+        
+        self._flush_alert_queue([
+            alerts[0] if len(alerts) == 1 else self._build_digest(alerts)
+            for alerts in groups.values()
+        ])
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Return a logged-in SMTP connection, reusing the cached one when possible.
+        
+        Must be called with self._smtp_lock held. A cached connection is
+        reused only if it was used within SMTP_MAX_IDLE_SEC and still
+        answers NOOP; otherwise a new one is opened.
+        
+        Returns:
+            Connected and authenticated SMTP client
+        """
+        if self._smtp is not None:
+            if time.time() - self._smtp_last_used < self.SMTP_MAX_IDLE_SEC:
+                try:
+                    if self._smtp.noop()[0] == 250:
+                        return self._smtp
+                except (smtplib.SMTPException, OSError):
+                    pass
+            self._close_smtp()
+        
+        if self.smtp_port == 587:
+            # Use STARTTLS for port 587
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30)
+            server.starttls()
+        else:
+            # Use SSL for port 465
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, timeout=30)
+        
+        try:
+            server.login(self.smtp_user, self.smtp_pass)
+        except Exception:
+            server.close()
+            raise
+        
+        self._smtp = server
+        self._smtp_last_used = time.time()
+        return server
+    
+    def _close_smtp(self):
+        """Close and drop the cached SMTP connection (caller holds self._smtp_lock)."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
 
+    def _parse_health(self, container: Dict) -> Optional[str]:
+        """
+        Read the health status from a container summary's Status string.
+        
+        Args:
+            container: Container summary dict from the low-level containers API
+            
+        Returns:
+            Health status string or None if no healthcheck
+        """
+        # Containers without a healthcheck have no health token in Status
+        match = self._HEALTH_RE.search(container.get('Status') or '')
+        return match.group(1) if match else None
     
-    def check_single_container(self, container) -> ContainerHealthCheck:
+    def check_single_container(
+        self,
+        container: Dict,
+        now: datetime,
+        current_status: Optional[str]
+    ) -> ContainerHealthCheck:
         """
-        Check health of a single container (thread-safe operation).
+        Build the health check result for one container from the bulk listing.
         
         Args:
-            container: Docker container object
+            container: Container summary dict from the low-level containers API
+            now: Timestamp shared by every container in this sweep
+            current_status: Health parsed from the listing by _parse_health
             
         Returns:
             ContainerHealthCheck object with results
         """
-        container_name = container.name
-        project_name = self._get_project_name(container)
-        current_status = self.get_container_health(container)
+        container_name = container['Names'][0].lstrip('/')
+        project_name = self._get_project_name(container, container_name)
         
         # Get previous state
-        previous_state = self.container_states.get(container_name, {})
-        previous_status = previous_state.get('status')
+        previous_state = self.container_states.get(container_name)
+        previous_status = previous_state.status if previous_state is not None else None
         
         return ContainerHealthCheck(
             container_name=container_name,
             project_name=project_name,
             status=current_status,
-            previous_status=previous_status
+            previous_status=previous_status,
+            timestamp=now,
+            container_id=container['Id']
         )
     
-    def recheck_single_container(self, container_name: str, project_name: str) -> Tuple[str, Optional[str]]:
+    def _recheck_statuses(self, container_names: List[str]) -> Dict[str, Optional[str]]:
         """
-        Recheck a single container's health (used in Phase 2).
+        Current health of several containers from one filtered listing call.
+        
+        Used by Phase 2 instead of an inspect per container; health is
+        parsed from the Status strings exactly as in the Phase 1 sweep.
+        Containers whose recorded id is gone are looked up again by name,
+        since a fix during the wait (e.g. docker compose up -d) recreates
+        the container under a new id; the new id is then recorded.
         
         Args:
-            container_name: Name of the container
-            project_name: Project name
+            container_names: Names of tracked containers
             
         Returns:
-            Tuple of (container_name, current_status)
+            Dict of container_name -> health status, 'not_found' if the
+            container is no longer running, or None if it has no healthcheck
         """
+        refs = {name: self._container_ref(name) for name in container_names}
+        containers = self.api.containers(filters={'id': list(refs.values())})
+        found = {container['Id']: self._parse_health(container) for container in containers}
+        statuses = {name: found.get(ref, 'not_found') for name, ref in refs.items()}
+        
+        missing = [name for name, status in statuses.items() if status == 'not_found']
+        if missing:
+            # The name filter is a pattern match, so keep exact names only
+            for container in self.api.containers(filters={'name': missing}):
+                name = container['Names'][0].lstrip('/')
+                if statuses.get(name) != 'not_found':
+                    continue
+                statuses[name] = self._parse_health(container)
+                state = self.container_states.get(name)
+                if state is not None:
+                    state.id = container['Id']
+        return statuses
+    
+    def _fetch_logs(self, container_names: List[str]) -> Dict[str, str]:
+        """
+        Fetch alert logs for several containers concurrently.
+        
+        The pool is sized to the work and bounded by 0.8 x check interval.
+        It is not a with-block: leaving one would block on a hung Docker call.
+        
+        Args:
+            container_names: Names of the containers
+            
+        Returns:
+            Dict of container_name -> log text (or an explanation if unavailable)
+        """
+        if not container_names:
+            return {}
+        
+        workers = min(self.max_workers, len(container_names))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='logs')
         try:
-            container = self.client.containers.get(container_name)
-            status = self.get_container_health(container)
-            return (container_name, status)
-        except docker.errors.NotFound:
-            return (container_name, 'not_found')
-        except Exception as e:
-            logger.error(f"Error rechecking {container_name}: {e}")
-            return (container_name, None)
+            futures = {
+                executor.submit(self.get_container_logs, name, self.log_tail_lines): name
+                for name in container_names
+            }
+            done, _ = wait(futures, timeout=self.check_interval_sec * 0.8)
+            
+            logs = dict.fromkeys(container_names, "Could not retrieve logs: timed out")
+            for future in done:
+                logs[futures[future]] = future.result()
+            return logs
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def phase_one_check_all(self) -> Tuple[List[ContainerHealthCheck], List[ContainerHealthCheck]]:
         """
-        Phase 1: Check all containers concurrently.
+        Phase 1: Check all containers with a single Docker API call.
+        
+        The /containers/json listing, filtered to containers that have a
+        healthcheck, already carries each one's health in its Status string,
+        so no per-container inspect is needed. Only
+        containers whose (id, health) pair differs from the last sweep are
+        processed; for a stable fleet that is none of them.
         
         Returns:
             Tuple of (needs_retry_list, immediate_alert_list)
@@ -483,84 +1207,328 @@ Monitoring all containers with healthchecks
         logger.info("Phase 1: Checking all containers...")
 
         try:
-            containers = self.client.containers.list()
+            # The sweep supersedes any Docker events queued before it
+            self._drain_health_events()
+            listed_at = time.time()
+            # Let the daemon drop containers without a healthcheck; they would
+            # be skipped anyway and are never tracked in container_states
+            containers = self.api.containers(filters={'health': ['healthy', 'unhealthy', 'starting']})
             
             if not containers:
-                logger.debug("No containers running")
-                return ([], [])
-            
-            # Submit all health checks concurrently
-            futures = {
-                self.executor.submit(self.check_single_container, container): container 
-                for container in containers
-            }
+                logger.debug("No running containers with healthchecks")
             
             needs_retry = []
             immediate_alerts = []
             seen_containers = set()
+            seen_ids = set()
+            fingerprint = set()
+            now = datetime.now()
             
-            # Collect results as they complete
-            for future in as_completed(futures):
+            for container in containers:
+                seen_ids.add(container['Id'])
+                key = None
                 try:
-                    health_check = future.result()
-                    seen_containers.add(health_check.container_name)
+                    seen_containers.add(container['Names'][0].lstrip('/'))
+                    current_status = self._parse_health(container)
+                    key = (container['Id'], current_status)
+                    fingerprint.add(key)
                     
-                    # Skip containers without healthchecks
-                    if health_check.status is None:
+                    # Unchanged since the last sweep: nothing to do
+                    if key in self._last_tick_fingerprint:
                         continue
                     
-                    # Update state
-                    self.container_states[health_check.container_name] = {
-                        'status': health_check.status,
-                        'project': health_check.project_name,
-                        'last_check': health_check.timestamp
-                    }
-                    
-                    # Handle status changes
-                    if health_check.status_changed:
-                        logger.info(
-                            f"[{health_check.project_name}] {health_check.container_name}: "
-                            f"{health_check.previous_status or 'unknown'} → {health_check.status}"
-                        )
-                        
-                        if health_check.became_unhealthy:
-                            # Queue for retry
-                            needs_retry.append(health_check)
-                        
-                        elif health_check.became_healthy:
-                            # Immediate alert for recovery
-                            immediate_alerts.append(health_check)
+                    health_check = self.check_single_container(container, now, current_status)
+                    self._record_health_check(health_check, needs_retry, immediate_alerts)
                 
                 except Exception as e:
-                    container = futures[future]
-                    logger.error(f"Error processing health check for {container.name}: {e}")
-            
-            # Check for disappeared containers
-            for container_name, state in list(self.container_states.items()):
-                if container_name not in seen_containers:
-                    previous_status = state['status']
-                    project_name = state['project']
-                    
-                    logger.warning(f"[{project_name}] {container_name}: Container no longer running")
-                    
-                    self.send_alert_email(
-                        container_name=container_name,
-                        project_name=project_name,
-                        status='not_found',
-                        details='Container is no longer running or has been removed.',
-                        previous_status=previous_status
-                    )
-                    
-                    # Remove from tracking
-                    del self.container_states[container_name]
+                    # Retry this container in full on the next sweep
+                    fingerprint.discard(key)
+                    logger.error(f"Error processing health check for {container.get('Names')}: {e}")
             
+            # Check for disappeared containers (the set difference is a snapshot,
+            # so _container_gone can remove entries while we iterate)
+            for container_name in self.container_states.keys() - seen_containers:
+                self._container_gone(
+                    container_name, now, 'Container is no longer running or has been removed.'
+                )
+            
+            # Forget project names of containers that are gone
+            for container_id in self._project_cache.keys() - seen_ids:
+                del self._project_cache[container_id]
+            
+            self._last_tick_fingerprint = fingerprint
+            
+            self._docker_backoff = 0.0
+            if self._events_subscribed_at >= listed_at:
+                # The stream (re)subscribed after the listing; changes in
+                # between are in neither, so keep the next sweep due
+                self._next_sweep_at = 0.0
+            else:
+                self._next_sweep_at = time.time() + self.sweep_interval_sec
             logger.info(f"Phase 1: Complete. Found {len(needs_retry)} unhealthy, {len(immediate_alerts)} recovered")
             return (needs_retry, immediate_alerts)
         
         except Exception as e:
-            logger.error(f"Error in Phase 1 health checks: {e}")
+            self._docker_backoff = self._compute_backoff_seconds(self._docker_backoff)
+            logger.error(
+                f"Error in Phase 1 health checks: {e}; "
+                f"backing off {self._docker_backoff:.0f}s before the next check"
+            )
             return ([], [])
     
+    def _container_gone(self, container_name: str, now: datetime, details: str):
+        """
+        Queue a not_found alert for a tracked container and stop tracking it.
+        
+        Args:
+            container_name: Name of a container in self.container_states
+            now: When the container was found missing
+            details: Alert details
+        """
+        state = self.container_states.pop(container_name)
+        logger.warning(f"[{state.project}] {container_name}: Container no longer running")
+        
+        self._pending_alerts.append(self._build_alert(
+            container_name=container_name,
+            project_name=state.project,
+            status='not_found',
+            details=details,
+            previous_status=state.status,
+            timestamp=now
+        ))
+    
+    def phase_one_process_events(self) -> Tuple[List[ContainerHealthCheck], List[ContainerHealthCheck]]:
+        """
+        Phase 1 between full sweeps: apply Docker events received since the last cycle.
+        
+        Only containers with health or lifecycle (start/die/destroy) events
+        are touched, so a quiet fleet costs no Docker API calls at all.
+        Several events for one container collapse to the latest.
+        
+        Returns:
+            Tuple of (needs_retry_list, immediate_alert_list)
+        """
+        latest: Dict[str, Dict] = {}
+        for event in self._drain_health_events():
+            # 'id' is deprecated and may be missing; Actor.ID is the same id
+            latest[event.get('id') or (event.get('Actor') or {}).get('ID')] = event
+        
+        needs_retry = []
+        immediate_alerts = []
+        now = datetime.now()
+        
+        if latest:
+            # State is about to change outside a sweep
+            self._last_tick_fingerprint.clear()
+        
+        for event in latest.values():
+            try:
+                action = event.get('Action') or event.get('status') or ''
+                if action.startswith('health_status'):
+                    health_check = self._health_check_from_event(event, now)
+                else:
+                    health_check = self._health_check_from_lifecycle_event(event, now)
+                if health_check is not None:
+                    self._record_health_check(health_check, needs_retry, immediate_alerts)
+            except Exception as e:
+                logger.error(f"Error processing health event {event}: {e}")
+        
+        if latest:
+            logger.info(
+                f"Phase 1: Processed {len(latest)} Docker event(s). "
+                f"Found {len(needs_retry)} unhealthy, {len(immediate_alerts)} recovered"
+            )
+        return (needs_retry, immediate_alerts)
+    
+    def _record_health_check(
+        self,
+        health_check: ContainerHealthCheck,
+        needs_retry: List[ContainerHealthCheck],
+        immediate_alerts: List[ContainerHealthCheck]
+    ):
+        """
+        Store a health check result and classify its status change.
+        
+        Args:
+            health_check: Result to record
+            needs_retry: Collects containers that became unhealthy
+            immediate_alerts: Collects containers that recovered
+        """
+        # Skip containers without healthchecks
+        if health_check.status is None:
+            return
+        
+        # Single write per check; the common unchanged case only bumps
+        # last_check (project follows the id, so it cannot change alone)
+        container_id = health_check.container_id or health_check.container_name
+        checked_at = health_check.timestamp.timestamp()
+        state = self.container_states.get(health_check.container_name)
+        if state is None:
+            self.container_states[health_check.container_name] = ContainerState(
+                health_check.status, health_check.project_name, checked_at, container_id
+            )
+        elif state.status != health_check.status or state.id != container_id:
+            state.status = health_check.status
+            state.project = health_check.project_name
+            state.last_check = checked_at
+            state.id = container_id
+        else:
+            state.last_check = checked_at
+        
+        # Handle status changes
+        if health_check.status_changed:
+            logger.info(
+                f"[{health_check.project_name}] {health_check.container_name}: "
+                f"{health_check.previous_status or 'unknown'} → {health_check.status}"
+            )
+            
+            if health_check.became_unhealthy:
+                # Queue for retry
+                needs_retry.append(health_check)
+            
+            elif health_check.became_healthy:
+                # Immediate alert for recovery
+                immediate_alerts.append(health_check)
+    
+    def _health_check_from_event(self, event: Dict, now: datetime) -> Optional[ContainerHealthCheck]:
+        """
+        Build a health check result from a Docker health_status event.
+        
+        Args:
+            event: Decoded event, e.g. Action "health_status: unhealthy"
+            now: Timestamp shared by every event in this batch
+            
+        Returns:
+            ContainerHealthCheck, or None if the event carries no usable status
+        """
+        action = event.get('Action') or event.get('status') or ''
+        status = action.partition(':')[2].strip()
+        if status not in ('healthy', 'unhealthy', 'starting'):
+            return None
+        
+        actor = event.get('Actor') or {}
+        attributes = actor.get('Attributes') or {}
+        container_name = attributes.get('name')
+        if not container_name:
+            return None
+        
+        # Event attributes carry the container's labels
+        container_id = event.get('id') or actor.get('ID')
+        container = {'Id': container_id, 'Labels': attributes}
+        previous_state = self.container_states.get(container_name)
+        previous_status = previous_state.status if previous_state is not None else None
+        
+        return ContainerHealthCheck(
+            container_name=container_name,
+            project_name=self._get_project_name(container, container_name),
+            status=status,
+            previous_status=previous_status,
+            timestamp=now,
+            container_id=container_id
+        )
+    
+    def _health_check_from_lifecycle_event(self, event: Dict, now: datetime) -> Optional[ContainerHealthCheck]:
+        """
+        Apply a container start, die or destroy event.
+        
+        A tracked container that is no longer running takes the same
+        not_found path as one missing from a sweep. A running container is
+        inspected (a die may have been followed by a restart) and its health
+        returned like a health_status event.
+        
+        Args:
+            event: Decoded container event
+            now: Timestamp shared by every event in this batch
+            
+        Returns:
+            ContainerHealthCheck for a running container with a healthcheck, else None
+        """
+        action = event.get('Action') or event.get('status') or ''
+        actor = event.get('Actor') or {}
+        attributes = actor.get('Attributes') or {}
+        container_name = attributes.get('name')
+        if not container_name:
+            return None
+        
+        previous_state = self.container_states.get(container_name)
+        if previous_state is None and action != 'start':
+            # Untracked containers have nothing to report when they stop
+            return None
+        
+        container_id = event.get('id') or actor.get('ID')
+        attrs = None
+        if action != 'destroy':
+            try:
+                attrs = self.api.inspect_container(container_id)
+            except docker.errors.NotFound:
+                pass
+        
+        if attrs is None or not (attrs.get('State') or {}).get('Running'):
+            if previous_state is not None:
+                self._container_gone(container_name, now, f"Container stopped or was removed ({action} event).")
+            return None
+        
+        status = self.get_container_health(attrs)
+        if status is None:
+            return None
+        
+        container = {'Id': container_id, 'Labels': attributes}
+        return ContainerHealthCheck(
+            container_name=container_name,
+            project_name=self._get_project_name(container, container_name),
+            status=status,
+            previous_status=previous_state.status if previous_state is not None else None,
+            timestamp=now,
+            container_id=container_id
+        )
+    
+    def _drain_health_events(self) -> List[Dict]:
+        """Remove and return every queued health event."""
+        events = []
+        while True:
+            try:
+                events.append(self._health_events.get_nowait())
+            except queue.Empty:
+                return events
+    
+    def _watch_health_events(self):
+        """
+        Stream Docker container events into self._health_events (runs in a thread).
+        
+        Subscribes to health_status plus the start/die/destroy lifecycle
+        events, so stopped and new containers are noticed between sweeps.
+        
+        Reconnects with backoff if the stream drops, and schedules a full
+        sweep whenever it (re)subscribes since events may have been missed.
+        """
+        backoff = 0.0
+        while not self.shutdown_requested.is_set():
+            try:
+                self._event_stream = self.api.events(
+                    filters={'type': 'container', 'event': ['health_status', 'start', 'die', 'destroy']},
+                    decode=True
+                )
+                self._events_connected = True
+                self._events_subscribed_at = time.time()
+                self._next_sweep_at = 0.0
+                backoff = 0.0
+                logger.info("Subscribed to Docker container events")
+                
+                for event in self._event_stream:
+                    self._health_events.put(event)
+            
+            except Exception as e:
+                if self.shutdown_requested.is_set():
+                    break
+                logger.warning(f"Docker event stream failed: {e}")
+            
+            finally:
+                self._events_connected = False
+            
+            backoff = self._compute_backoff_seconds(backoff)
+            if self.shutdown_requested.wait(timeout=backoff):
+                break
+    
     def phase_two_recheck_unhealthy(self, needs_retry: List[ContainerHealthCheck]):
         """
         Phase 2: Recheck containers that became unhealthy after waiting.
@@ -578,40 +1546,44 @@ Monitoring all containers with healthchecks
         
         # Interruptible sleep with logging
         sleep_seconds = int(self.wait_and_check_again_min * 60)
-        start_time = time.time()
-        end_time = start_time + sleep_seconds
         
         logger.info(f"Sleeping for {sleep_seconds} seconds before Phase 2 recheck...")
         
-        while time.time() < end_time and not self.shutdown_requested:
-            remaining = int(end_time - time.time())
-            if remaining > 0:
-                # Sleep in 1-second intervals to allow for shutdown
-                time.sleep(min(1, remaining))
-            else:
-                break
-        
-        if self.shutdown_requested:
+        # Blocks once; returns early (True) as soon as shutdown is signalled
+        if self.shutdown_requested.wait(timeout=sleep_seconds):
             logger.info("Phase 2 sleep interrupted by shutdown request")
             return
         
         logger.info("Sleep complete, starting Phase 2 recheck...")
         
-        # Submit all rechecks concurrently
-        futures = {
-            self.executor.submit(
-                self.recheck_single_container, 
-                health_check.container_name,
-                health_check.project_name
-            ): health_check
-            for health_check in needs_retry
-        }
+        # Rechecks update container_states outside a sweep
+        self._last_tick_fingerprint.clear()
+        
+        # One listing call rechecks every container at once
+        try:
+            statuses = self._recheck_statuses([hc.container_name for hc in needs_retry])
+        except Exception as e:
+            logger.error(f"Phase 2: Error rechecking containers: {e}")
+            now = datetime.now()
+            for health_check in needs_retry:
+                self._handle_stuck_recheck(health_check, str(e), now)
+            return
+        
+        now = datetime.now()
+        checked_at = now.timestamp()
+        
+        # Only containers still unhealthy need logs, fetched concurrently
+        logs = self._fetch_logs([
+            hc.container_name for hc in needs_retry
+            if statuses[hc.container_name] not in ('healthy', 'not_found')
+        ])
         
         # Process recheck results
-        for future in as_completed(futures):
-            original_check = futures[future]
+        for original_check in needs_retry:
+            container_name = original_check.container_name
             try:
-                container_name, current_status = future.result()
+                current_status = statuses[container_name]
+                self._stuck_counts.pop(container_name, None)
                 
                 if current_status == 'healthy':
                     logger.info(
@@ -619,34 +1591,83 @@ Monitoring all containers with healthchecks
                         f"Recovered during retry wait; no alert sent"
                     )
                     # Update state
-                    self.container_states[container_name]['status'] = 'healthy'
+                    state = self.container_states[container_name]
+                    state.status = 'healthy'
+                    state.last_check = checked_at
                     continue
                 
                 # Still unhealthy - send alert with logs
-                logs = self.get_container_logs(container_name, tail=self.log_tail_lines)
-                
                 if current_status == 'not_found':
                     details = 'Container disappeared during retry wait period.'
                 else:
-                    details = f"Container remained {current_status} after {self.wait_and_check_again_min} minute{'s' if self.wait_and_check_again_min > 1.0 else ''}.\n\nRecent logs:\n\n{logs}"
+                    details = f"Container remained {current_status} after {self.wait_and_check_again_min} minute{'s' if self.wait_and_check_again_min > 1.0 else ''}.\n\nRecent logs:\n\n{logs[container_name]}"
                 
-                self.send_alert_email(
+                self._pending_alerts.append(self._build_alert(
                     container_name=container_name,
                     project_name=original_check.project_name,
                     status=current_status or 'unknown',
                     details=details,
-                    previous_status=original_check.previous_status
-                )
+                    previous_status=original_check.previous_status,
+                    timestamp=now
+                ))
                 
-                # Update state
-                if current_status:
-                    self.container_states[container_name]['status'] = current_status
+                # Update state; a vanished container is no longer tracked, so
+                # the next sweep does not report it missing a second time
+                if current_status == 'not_found':
+                    self.container_states.pop(container_name, None)
+                elif current_status:
+                    state = self.container_states[container_name]
+                    state.status = current_status
+                    state.last_check = checked_at
                 
             except Exception as e:
                 logger.error(
-                    f"Error rechecking {original_check.container_name}: {e}"
+                    f"Error rechecking {container_name}: {e}"
                 )
     
+    def _handle_stuck_recheck(self, original_check: ContainerHealthCheck, reason: str, now: datetime):
+        """
+        Handle a Phase 2 recheck that could not get an answer from Docker.
+        
+        The unconfirmed status is forgotten so the container is retried on a
+        later cycle; after STUCK_ALERT_AFTER consecutive failures a 'stuck'
+        alert is sent instead.
+        
+        Args:
+            original_check: Phase 1 result for the container
+            reason: Why the recheck failed
+            now: Timestamp shared by every result of this Phase 2 pass
+        """
+        container_name = original_check.container_name
+        project_name = original_check.project_name
+        count = self._stuck_counts.get(container_name, 0) + 1
+        state = self.container_states.get(container_name)
+        
+        logger.warning(
+            f"[{project_name}] {container_name}: Recheck failed ({count}/{self.STUCK_ALERT_AFTER})"
+        )
+        
+        if count < self.STUCK_ALERT_AFTER:
+            self._stuck_counts[container_name] = count
+            if state is not None:
+                state.status = original_check.previous_status
+            return
+        
+        self._stuck_counts.pop(container_name, None)
+        self._pending_alerts.append(self._build_alert(
+            container_name=container_name,
+            project_name=project_name,
+            status='stuck',
+            details=(
+                f"Docker did not report this container's health on {count} consecutive "
+                f"rechecks ({reason}). The Docker daemon may be overloaded."
+            ),
+            previous_status=original_check.previous_status,
+            timestamp=now
+        ))
+        if state is not None:
+            state.status = 'stuck'
+    
     def handle_immediate_alerts(self, immediate_alerts: List[ContainerHealthCheck]):
         """
         Send immediate alerts for containers that recovered.
@@ -657,31 +1678,40 @@ Monitoring all containers with healthchecks
         for health_check in immediate_alerts:
             details = f"Container recovered to healthy status."
             
-            self.send_alert_email(
+            self._pending_alerts.append(self._build_alert(
                 container_name=health_check.container_name,
                 project_name=health_check.project_name,
                 status=health_check.status,
                 details=details,
-                previous_status=health_check.previous_status
-            )
+                previous_status=health_check.previous_status,
+                timestamp=health_check.timestamp
+            ))
     
     def check_all_containers(self):
         """
         Main health check orchestration using two-phase pattern.
         
-        Phase 1: Check all containers, identify those needing retry
+        Phase 1: Check all containers (or just the containers with new
+                 container events between full sweeps), identify those needing retry
         Phase 2: Wait and recheck unhealthy containers before alerting
         """
-        # Phase 1: Initial concurrent health checks
-        needs_retry, immediate_alerts = self.phase_one_check_all()
+        # Phase 1: Full sweep when due or when the event stream is down
+        if not self._events_connected or time.time() >= self._next_sweep_at:
+            needs_retry, immediate_alerts = self.phase_one_check_all()
+        else:
+            needs_retry, immediate_alerts = self.phase_one_process_events()
         
         # Handle immediate alerts (recoveries)
         if immediate_alerts:
             self.handle_immediate_alerts(immediate_alerts)
         
+        # Send Phase 1 alerts now rather than holding them through the Phase 2 wait
+        self._flush_pending_alerts()
+        
         # Phase 2: Wait and recheck unhealthy containers
-        if needs_retry and not self.shutdown_requested:
+        if needs_retry and not self.shutdown_requested.is_set():
             self.phase_two_recheck_unhealthy(needs_retry)
+            self._flush_pending_alerts()
     
     def run(self):
         """Run the health monitoring loop."""
@@ -689,15 +1719,24 @@ Monitoring all containers with healthchecks
         logger.info("▶ MULTI-PROJECT DOCKER HEALTH MONITOR STARTED")
         logger.info("=" * 70)
         
+        self._event_thread = threading.Thread(
+            target=self._watch_health_events, name='health-events', daemon=True
+        )
+        self._event_thread.start()
+        
+        self._alert_thread = threading.Thread(
+            target=self._alert_sender_loop, name='alert-sender', daemon=True
+        )
+        self._alert_thread.start()
+        
         try:
             # Initial check
             self.check_all_containers()
             
             # Main monitoring loop
-            while not self.shutdown_requested:
-                time.sleep(self.check_interval_sec)
-                
-                if self.shutdown_requested:
+            while not self.shutdown_requested.is_set():
+                # Check less often while the Docker daemon is failing
+                if self.shutdown_requested.wait(timeout=self.check_interval_sec + self._docker_backoff):
                     break
                 
                 self.check_all_containers()
@@ -709,10 +1748,16 @@ Monitoring all containers with healthchecks
             logger.exception(f"Fatal error in monitoring loop: {e}")
         
         finally:
-            # Shutdown executor gracefully
-            logger.info("Shutting down thread pool...")
-            self.executor.shutdown(wait=True, cancel_futures=True)
+            if self._event_stream is not None:
+                self._event_stream.close()
+            
+            # Let the sender deliver what it already holds before closing SMTP
+            self._alert_queue.put(None)
+            self._alert_thread.join(timeout=self.ALERT_DRAIN_TIMEOUT_SEC)
             
+            with self._smtp_lock:
+                self._close_smtp()
+
             logger.info("=" * 70)
             logger.info("◼ MULTI-PROJECT DOCKER HEALTH MONITOR STOPPED")
             logger.info("=" * 70)
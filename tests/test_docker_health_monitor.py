@@ -0,0 +1,216 @@
+"""
+Regression tests for docker_health_monitor.
+
+The monitor is built without running __init__ (which connects to Docker
+and SMTP); only the attributes the method under test reads are set.
+"""
+import os
+import queue
+import re
+import smtplib
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime
+from email.message import EmailMessage
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docker_health_monitor as dhm
+
+
+def make_monitor() -> dhm.MultiProjectHealthMonitor:
+    monitor = dhm.MultiProjectHealthMonitor.__new__(dhm.MultiProjectHealthMonitor)
+    monitor.api = mock.Mock()
+    monitor.container_states = {}
+    monitor.log_bytes_cap = 65536
+    monitor._logs_cache = {}
+    monitor._logs_lock = threading.Lock()
+    return monitor
+
+
+class GetContainerLogsTest(unittest.TestCase):
+
+    def test_logs_are_not_followed(self):
+        monitor = make_monitor()
+        stream = mock.MagicMock()
+        stream.__iter__.return_value = iter([b'line 1\n', b'line 2\n'])
+        monitor.api.logs.return_value = stream
+
+        logs = monitor.get_container_logs('web-1', tail=10)
+
+        self.assertEqual(logs, 'line 1\nline 2\n')
+        # docker-py follows a streamed log unless told otherwise
+        self.assertIs(monitor.api.logs.call_args.kwargs['follow'], False)
+        stream.close.assert_called_once()
+
+
+class RecheckStatusesTest(unittest.TestCase):
+
+    def test_recreated_container_is_found_by_name(self):
+        monitor = make_monitor()
+        monitor.container_states['web-1'] = dhm.ContainerState('unhealthy', 'web', 0.0, 'old-id')
+
+        def containers(filters):
+            if 'id' in filters:
+                return []
+            return [
+                {'Id': 'new-id', 'Names': ['/web-1'], 'Status': 'Up 1 minute (healthy)'},
+                {'Id': 'other', 'Names': ['/web-10'], 'Status': 'Up 1 minute (unhealthy)'},
+            ]
+        monitor.api.containers.side_effect = containers
+
+        statuses = monitor._recheck_statuses(['web-1'])
+
+        self.assertEqual(statuses, {'web-1': 'healthy'})
+        self.assertEqual(monitor.container_states['web-1'].id, 'new-id')
+
+    def test_container_missing_by_id_and_name_is_not_found(self):
+        monitor = make_monitor()
+        monitor.container_states['web-1'] = dhm.ContainerState('unhealthy', 'web', 0.0, 'old-id')
+        monitor.api.containers.return_value = []
+
+        self.assertEqual(monitor._recheck_statuses(['web-1']), {'web-1': 'not_found'})
+
+
+class FlushAlertQueueTest(unittest.TestCase):
+
+    def test_failed_digest_counts_its_alerts(self):
+        monitor = make_monitor()
+        monitor._smtp_lock = threading.Lock()
+        monitor._smtp_retry_at = 0.0
+        monitor._smtp_backoff = 0.0
+        monitor._undelivered = []
+        monitor._close_smtp = mock.Mock()
+        monitor._deliver_alert = mock.Mock(side_effect=OSError('connection refused'))
+        parts = [
+            dhm.AlertRecord(name, 'web', 'unhealthy', ['ops@example.com'], None)
+            for name in ('web-1', 'web-2')
+        ]
+        digest = dhm.AlertRecord('2 containers', 'web', 'unhealthy', ['ops@example.com'], None, parts=parts)
+
+        with self.assertLogs(dhm.logger, 'ERROR') as logs:
+            monitor._flush_alert_queue([digest])
+
+        self.assertIn('retrying 2 alert(s)', logs.output[0])
+        self.assertEqual(monitor._undelivered, parts)
+
+    def test_rejected_alert_is_dropped_and_others_still_sent(self):
+        monitor = make_monitor()
+        monitor._smtp_lock = threading.Lock()
+        monitor._smtp_retry_at = 0.0
+        monitor._smtp_backoff = 0.0
+        monitor._undelivered = []
+        monitor._close_smtp = mock.Mock()
+        rejected, deferred, ok = [
+            dhm.AlertRecord(name, 'web', 'unhealthy', [f'{name}@example.com'], None)
+            for name in ('web-1', 'web-2', 'web-3')
+        ]
+        errors = {
+            'web-1': smtplib.SMTPRecipientsRefused({'web-1@example.com': (550, b'no such user')}),
+            'web-2': smtplib.SMTPDataError(451, b'try again later'),
+        }
+
+        def deliver(alert):
+            if alert.container_name in errors:
+                raise errors[alert.container_name]
+        monitor._deliver_alert = mock.Mock(side_effect=deliver)
+
+        with self.assertLogs(dhm.logger, 'WARNING'):
+            monitor._flush_alert_queue([rejected, deferred, ok])
+
+        self.assertEqual(monitor._deliver_alert.call_count, 3)
+        self.assertEqual(monitor._undelivered, [deferred])
+        monitor._close_smtp.assert_not_called()
+
+
+class PhaseOneCheckAllTest(unittest.TestCase):
+
+    def make_sweeping_monitor(self) -> dhm.MultiProjectHealthMonitor:
+        monitor = make_monitor()
+        monitor._health_events = queue.Queue()
+        monitor._last_tick_fingerprint = set()
+        monitor._project_cache = {}
+        monitor._events_subscribed_at = 0.0
+        monitor.sweep_interval_sec = 300
+        monitor.api.containers.return_value = []
+        return monitor
+
+    def test_next_sweep_is_scheduled_after_listing(self):
+        monitor = self.make_sweeping_monitor()
+
+        monitor.phase_one_check_all()
+
+        self.assertGreater(monitor._next_sweep_at, time.time())
+
+    def test_subscription_during_listing_keeps_sweep_due(self):
+        monitor = self.make_sweeping_monitor()
+
+        def containers(filters):
+            # The event watcher (re)subscribes while the listing is in flight
+            monitor._events_subscribed_at = time.time()
+            return []
+        monitor.api.containers.side_effect = containers
+
+        monitor.phase_one_check_all()
+
+        self.assertEqual(monitor._next_sweep_at, 0.0)
+
+
+class ProcessEventsTest(unittest.TestCase):
+
+    def test_events_without_id_are_keyed_by_actor_id(self):
+        monitor = make_monitor()
+        monitor._last_tick_fingerprint = set()
+        events = [
+            {'Action': 'health_status: unhealthy', 'Actor': {'ID': 'id-1'}},
+            {'Action': 'health_status: unhealthy', 'Actor': {'ID': 'id-2'}},
+        ]
+        monitor._drain_health_events = mock.Mock(return_value=events)
+        monitor._health_check_from_event = mock.Mock(return_value=None)
+
+        monitor.phase_one_process_events()
+
+        self.assertEqual(monitor._health_check_from_event.call_count, 2)
+
+
+class RecordHealthCheckTest(unittest.TestCase):
+
+    def test_unhealthy_after_stuck_alert_is_retried(self):
+        monitor = make_monitor()
+        monitor.container_states['web-1'] = dhm.ContainerState('stuck', 'web', 0.0, 'id-1')
+        health_check = dhm.ContainerHealthCheck(
+            container_name='web-1',
+            project_name='web',
+            status='unhealthy',
+            previous_status='stuck',
+            timestamp=datetime.now(),
+            container_id='id-1'
+        )
+        needs_retry, immediate_alerts = [], []
+
+        monitor._record_health_check(health_check, needs_retry, immediate_alerts)
+
+        self.assertEqual(needs_retry, [health_check])
+        self.assertEqual(immediate_alerts, [])
+        self.assertEqual(monitor.container_states['web-1'].status, 'unhealthy')
+
+
+class AlertRecordTest(unittest.TestCase):
+
+    def test_serialized_message_uses_crlf(self):
+        message = EmailMessage()
+        message['Subject'] = 'web-1 unhealthy'
+        message.set_content('line 1\nline 2\n')
+        alert = dhm.AlertRecord('web-1', 'web', 'unhealthy', ['ops@example.com'], message)
+
+        raw = alert.as_bytes()
+
+        self.assertIn(b'\r\n\r\nline 1\r\nline 2\r\n', raw)
+        self.assertIsNone(re.search(rb'(?<!\r)\n', raw))
+
+
+if __name__ == '__main__':
+    unittest.main()